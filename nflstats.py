@@ -18,6 +18,8 @@ DEPENDENCIES:
 
 COMMAND-LINE DOCUMENTATION:
 usage: nflstats.py [-h] [-y YEAR] [-w WEEK] [-t TEAM] [-s SITE] [-c] [-r]
+                   [-n WINDOW] [--split {site,division}] [--cache CACHE]
+                   [--clear-cache]
 
 Display NFL team stats for a given season, teams and weeks
 
@@ -37,6 +39,34 @@ optional arguments:
   -c, --cum             Flag to show cumulative stats instead of single-game
                         stats.
   -r, --rate            Flag to show rate stats instead of gross stats.
+  -n WINDOW, --window WINDOW
+                        Show stats totalled over each team's last N games
+                        instead of the whole season. Implies --cum.
+  --split {site,division}
+                        Total home and away games separately ('site'), or
+                        division and non-division games separately
+                        ('division'). Implies --cum. A 'split' column
+                        shows which total each row belongs to.
+  --cache CACHE         Directory to save results in. Asking for the same
+                        stats again reads them from here instead of
+                        collecting them again.
+  --clear-cache         Flag to delete everything saved in the --cache
+                        directory before getting the stats.
+
+usage: nflstats.py warm [-h] [--cache CACHE] [-y YEAR] [-w WEEK] [-j JOBS]
+                        [--restart]
+
+Save the stats for a given season(s) ahead of time, so that the GUI and
+later queries using the same --cache directory don't have to collect them
+
+optional arguments:
+  --cache CACHE         Directory to save results in. The GUI always uses
+                        the default. Default value is ~/.nflstats
+  -j JOBS, --jobs JOBS  How many seasons to compile at once, each in its
+                        own process. Default value is 4
+  --restart             Flag to forget which seasons are already done and
+                        save every season again.
+  (-y and -w work the same as above)
 
 -------------------------------------------------------------------------------
 
@@ -60,12 +90,40 @@ $ python nflstats.py -y 2010,2012-2014 -w 3,5-9,13 -cr
 $ python nflstats.py -y 2011 -t TB,NYG
     -- displays stats for Tampa Bay, and New York Giants for all of 2011.
     -- use commas to separate team names
+
+$ python nflstats.py -y 2014 -t NE -n 4 -r
+    -- displays New England's rate stats over its last 4 games at each
+       week of 2014. Bye weeks are skipped, not counted as games.
+
+$ python nflstats.py -y 2014 -t NE --split site
+    -- displays New England's season totals for home and away games
+       separately.
+
+$ python nflstats.py warm -y 2013-2015
+    -- saves the stat tables for all teams and for each team in 2013 to
+       2015 (with and without -c and -r), and the player stats,
+       play-by-play and scoring plays for every game, to ~/.nflstats.
+       Reports how many games per second were processed. Run it again
+       after an interruption to pick up where it left off.
+
+$ python nflstats.py -y 2014 -t IND --cache ~/.nflstats
+    -- the second time this is run, the stats are read from ~/.nflstats.
+       Results that include the current season are refreshed each week
+       and at least once an hour.
 """
 
 from __future__ import division
+import copy
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import time
 import nflgame as ng
 import nflgame.live as nl
-from collections import defaultdict
+from collections import defaultdict, deque, OrderedDict
+from multiprocessing import Pool
 
 CURRENT_YEAR, CURRENT_WEEK = nl.current_year_and_week()
 
@@ -97,20 +155,78 @@ STAT_MAP = {'passing_cmp': 'p_cmp', 'passing_att': 'p_att',
             'defense_ast': 'd_asts', 'defense_ffum': 'ffum',
             'fumbles_trcv': 'frec'}
 
+DIVISIONS = {'BUF': 'AFC East', 'MIA': 'AFC East', 'NE': 'AFC East',
+             'NYJ': 'AFC East', 'BAL': 'AFC North', 'CIN': 'AFC North',
+             'CLE': 'AFC North', 'PIT': 'AFC North', 'HOU': 'AFC South',
+             'IND': 'AFC South', 'JAC': 'AFC South', 'JAX': 'AFC South',
+             'TEN': 'AFC South', 'DEN': 'AFC West', 'KC': 'AFC West',
+             'OAK': 'AFC West', 'SD': 'AFC West', 'LAC': 'AFC West',
+             'DAL': 'NFC East', 'NYG': 'NFC East', 'PHI': 'NFC East',
+             'WAS': 'NFC East', 'CHI': 'NFC North', 'DET': 'NFC North',
+             'GB': 'NFC North', 'MIN': 'NFC North', 'ATL': 'NFC South',
+             'CAR': 'NFC South', 'NO': 'NFC South', 'TB': 'NFC South',
+             'ARI': 'NFC West', 'SF': 'NFC West', 'SEA': 'NFC West',
+             'STL': 'NFC West', 'LA': 'NFC West'}
+
+SPLITS = ['site', 'division']
+
+GAME_VIEWS = ['player', 'pbp', 'scores']
+
+CACHE_DIR = os.path.join(os.path.expanduser('~'), '.nflstats')
+
+WARM_PROGRESS = 'warm-progress'
+
+CURRENT_SEASON_TTL = 3600  # seconds a cached current-season result is kept on disk
+
+class RollingTotal(object):
+    """
+    A running total of a team's and its opponents' stats over its last
+    `size` games (or all games if size is None). Each game is added once
+    and subtracted once when it leaves the window, so every step costs
+    the same no matter how large the window is.
+    """
+    def __init__(self, size=None):
+        self.size = size
+        self.games = deque()
+        self.own = defaultdict(lambda: 0)
+        self.opp = defaultdict(lambda: 0)
+
+    def push(self, own, opp):
+        """
+        Add one game's stats to the total, dropping the oldest game
+        if the window is full.
+        """
+        game = ({stat: own[stat] for stat in ALL_STATS + ['pts']},
+                {stat: opp[stat] for stat in ALL_STATS + ['pts']})
+        self.games.append(game)
+        for stat in ALL_STATS + ['pts']:
+            self.own[stat] += game[0][stat]
+            self.opp[stat] += game[1][stat]
+        if self.size and len(self.games) > self.size:
+            old_own, old_opp = self.games.popleft()
+            for stat in ALL_STATS + ['pts']:
+                self.own[stat] -= old_own[stat]
+                self.opp[stat] -= old_opp[stat]
+
 class League(object):
     """
     A class that collects data using the nflgame API,
     then uses it to get cumulative and rate stats.
     """
-    def __init__(self, year, week, which_team, site, cum=False, rate=False):
+    def __init__(self, year, week, which_team, site, cum=False, rate=False,
+                 window=None, split=None):
         """
         Tell the league which teams, years, weeks, etc. to get data for.
+        A window (last N games) or a split ('site' or 'division') turns
+        on cumulative stats.
         """
         self.year = year
         self.week = week
         self.which_team = which_team
         self.site = site
-        self.cum = cum
+        self.window = window
+        self.split = split
+        self.cum = cum or bool(window) or bool(split)
         self.rate = rate
         self.teams = self.structure()
 
@@ -137,16 +253,14 @@ class League(object):
         """
         for teamdict in self.teams.values():
             for yeardict in teamdict.values():
-                weeks = 0
                 for weekdict in yeardict.values():
-                    if weekdict['OWN']['OPP']:
-                        weeks += 1
                     if self.cum:
                         own = weekdict['OWN_TOTAL']
                         opp = weekdict['OPP_TOTAL']
                         for side in [own, opp]:
-                            if weeks:
-                                side['ppg'] = round(side['pts'] / float(weeks), 2)
+                            if side['games']:
+                                side['ppg'] = round(side['pts'] /
+                                                    float(side['games']), 2)
                     for side_stats in weekdict.values():
                         if side_stats['passing_cmp'] > 0:
                             side_stats['passing_cmp%'] = \
@@ -172,24 +286,46 @@ class League(object):
                                   (side_stats['defense_sk'] +
                                    side_stats['passing_att']) * 100, 2)
 
+    def split_key(self, team, weekdict):
+        """
+        Return which split a game belongs to, so that it is only totalled
+        with other games from the same split.
+        """
+        if self.split == 'site':
+            return weekdict['OWN']['site']
+        if self.split == 'division':
+            opp = weekdict['OWN_TOTAL']['OPP']
+            division = DIVISIONS.get(team)
+            if division is not None and division == DIVISIONS.get(opp):
+                return 'div'
+            return 'nondiv'
+        return None
+
     def accumulate_stats(self):
         """
-        Add all stats from previous weeks to each weekly total
-        and store in the dictionary.
+        Add stats from previous games to each weekly total
+        and store in the dictionary. Weeks without a game (byes or
+        weeks that weren't selected) are skipped instead of resetting
+        the total. Only the last `window` games are counted if a window
+        is set, and only games from the same split if a split is set.
         """
-        for teamdict in self.teams.values():
+        for team, teamdict in self.teams.items():
             for yeardict in teamdict.values():
-                for week, thisweek in yeardict.items():
+                totals = dict()
+                for week in sorted(yeardict):
+                    thisweek = yeardict[week]
+                    if not thisweek['OWN']['OPP']:
+                        continue
+                    key = self.split_key(team, thisweek)
+                    if key not in totals:
+                        totals[key] = RollingTotal(self.window)
+                    total = totals[key]
+                    total.push(thisweek['OWN'], thisweek['OPP'])
                     for stat in ALL_STATS + ['pts']:
-                        if week - 1 in yeardict:
-                            lastweek = yeardict[week - 1]
-                            thisweek['OWN_TOTAL'][stat] = \
-                            lastweek['OWN_TOTAL'][stat] + thisweek['OWN'][stat]
-                            thisweek['OPP_TOTAL'][stat] = \
-                            lastweek['OPP_TOTAL'][stat] + thisweek['OPP'][stat]
-                        else:
-                            thisweek['OWN_TOTAL'][stat] = thisweek['OWN'][stat]
-                            thisweek['OPP_TOTAL'][stat] = thisweek['OPP'][stat]
+                        thisweek['OWN_TOTAL'][stat] = total.own[stat]
+                        thisweek['OPP_TOTAL'][stat] = total.opp[stat]
+                    thisweek['OWN_TOTAL']['games'] = len(total.games)
+                    thisweek['OPP_TOTAL']['games'] = len(total.games)
 
     def add_rushing_stats(self, which_team, year, week, game):
         """
@@ -249,6 +385,7 @@ class League(object):
                             home_team = self.teams[game.home][year][week]
                             home_team['OWN']['game'] = game
                             home_team['OWN']['OPP'] = game.away
+                            home_team['OWN']['site'] = 'home'
                             home_team['OWN']['pts'] = game.score_home
                             home_team['OPP']['pts'] = game.score_away
                             home_team['OWN_TOTAL']['OPP'] = game.away
@@ -259,6 +396,7 @@ class League(object):
                             away_team = self.teams[game.away][year][week]
                             away_team['OWN']['game'] = game
                             away_team['OWN']['OPP'] = '@ ' + game.home
+                            away_team['OWN']['site'] = 'away'
                             away_team['OWN']['pts'] = game.score_away
                             away_team['OPP']['pts'] = game.score_home
                             away_team['OWN_TOTAL']['OPP'] = game.home
@@ -333,6 +471,29 @@ class League(object):
         return [game.nice_score(), ''] + game.scores
 
 
+    def game_view(self, variety, team, year, week):
+        """
+        Returns the player stats ('player'), play-by-play ('pbp') or
+        scoring plays ('scores') for a game.
+        """
+        if variety == 'player':
+            return self.game_player_stats(team, year, week)
+        if variety == 'pbp':
+            return self.game_pbp(team, year, week)
+        return self.game_scoring_plays(team, year, week)
+
+    def game_count(self):
+        """
+        Return how many different games have been collected.
+        """
+        games = set()
+        for teamdict in self.teams.values():
+            for yeardict in teamdict.values():
+                for weekdict in yeardict.values():
+                    if 'game' in weekdict['OWN']:
+                        games.add(id(weekdict['OWN']['game']))
+        return len(games)
+
     def has_stats(self, team, year, week):
         """
         Return True if stats have been gathered from the given team,year,week.
@@ -363,6 +524,8 @@ class League(object):
             if team[0] in self.which_team:
                 output += '{team}\n'.format(team=team[3])
                 output += 'team'.rjust(6) + 'year'.rjust(6) + 'week'.rjust(6)
+                if self.split:
+                    output += 'split'.rjust(7)
                 output += ' ' + ' '.join([STAT_MAP[stat].rjust(6)
                                           for stat in which_stats])
                 output += 'Pts'.rjust(6) + 'oPts'.rjust(6)
@@ -375,6 +538,10 @@ class League(object):
                         if self.has_stats(team[0], year, week):
                             output += str(team[0]).rjust(6) + \
                                       str(year).rjust(6) + str(week).rjust(6)
+                            if self.split:
+                                weekdict = self.teams[team[0]][year][week]
+                                output += str(self.split_key(team[0],
+                                                             weekdict)).rjust(7)
                             own_stats = self.teams[team[0]][year][week][mine]
                             opp_stats = self.teams[team[0]][year][week][theirs]
                             output += ' '
@@ -402,13 +569,387 @@ class League(object):
         if self.rate:
             self.make_rate_stats()
 
-def run(year, week, which_team, site, cum=False, rate=False):
+def _utf8(value):
+    """
+    Turn the unicode strings json gives back into plain strings.
+    """
+    if isinstance(value, list):
+        return [_utf8(item) for item in value]
+    return value.encode('utf-8')
+
+class QueryCache(object):
+    """
+    Remembers compiled leagues and their stat tables so that asking for
+    the same stats twice doesn't collect everything again. Keeps the
+    `size` most recently used queries in memory, as long as their leagues
+    hold no more than `max_games` games between them, and, if a directory
+    is given, also saves the stat tables to disk. Results that include the
+    current season are thrown out once the week changes or after
+    CURRENT_SEASON_TTL seconds, since new games may have been played.
+    """
+    def __init__(self, size=32, max_games=512, path=None):
+        self.size = size
+        self.max_games = max_games
+        self.path = path
+        self.entries = OrderedDict()
+        self.games = 0
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        if path and not os.path.isdir(path):
+            try:
+                os.makedirs(path)
+            except OSError as error:
+                print >> sys.stderr, \
+                    "WARNING: can't use cache directory: {}".format(error)
+                self.path = None
+
+    @staticmethod
+    def key(year, week, which_team, site, cum=False, rate=False, window=None,
+            split=None):
+        """
+        Turn a query into a key that is the same no matter what order
+        the years, weeks, teams and sites were given in.
+        """
+        cum = cum or bool(window) or bool(split)
+        return (tuple(sorted(set(year))), tuple(sorted(set(week))),
+                tuple(sorted(set(which_team))), tuple(sorted(set(site))),
+                bool(cum), bool(rate), window, split)
+
+    @staticmethod
+    def league_key(league):
+        """
+        Return the key for the query a League was made from.
+        """
+        return QueryCache.key(league.year, league.week, league.which_team,
+                              league.site, league.cum, league.rate,
+                              league.window, league.split)
+
+    @staticmethod
+    def game_key(variety, team, year, week):
+        """
+        Return the key for one of a game's GAME_VIEWS. Like a query key,
+        it starts with the years it covers.
+        """
+        return ((year,), 'game', variety, team, week)
+
+    def game_view(self, variety, team, year, week):
+        """
+        Return the player stats, play-by-play or scoring plays for a
+        team's game. Checks memory, then disk, and only loads the game
+        if neither has it.
+        """
+        key = self.game_key(variety, team, year, week)
+        view = self.get(key)
+        if view is not None:
+            return view
+        self.misses += 1
+        league = League([year], [week], [team], ['home', 'away'])
+        league.make_team_stats()
+        view = league.game_view(variety, team, year, week)
+        self.put(key, view)
+        return view
+
+    def table(self, *query):
+        """
+        Return the stat table for a query. Checks memory, then disk, and
+        only compiles a League if neither has it.
+        """
+        table = self.get(self.key(*query))
+        if table is not None:
+            return table
+        return self.entry(*query)[1]
+
+    def get(self, key):
+        """
+        Return what is saved under a key, from memory or disk, or None.
+        """
+        entry = self._lookup(key)
+        if entry is not None:
+            self.hits += 1
+            return entry[1]
+        entry = self._load(key)
+        if entry is not None:
+            self.disk_hits += 1
+            self._remember(key, entry)
+            return entry[1]
+        return None
+
+    def entry(self, *query):
+        """
+        Return the compiled League and stat table for a query. Looks in
+        memory first, compiling and storing it on a miss. Tables read
+        from disk have no League, so they are compiled again here.
+        """
+        key = self.key(*query)
+        entry = self._lookup(key)
+        if entry is not None and entry[0] is not None:
+            self.hits += 1
+            return entry[:2]
+        self.misses += 1
+        league = League(*[list(part) if isinstance(part, tuple) else part
+                          for part in key])
+        league.compile()
+        return self.store(league)
+
+    def store(self, league, table=None):
+        """
+        Add an already compiled League to the cache, in memory and on
+        disk. Returns the League and its stat table.
+        """
+        if table is None:
+            table = str(league)
+        self.put(self.league_key(league), table, league)
+        return league, table
+
+    def put(self, key, value, league=None):
+        """
+        Save a table (or list of lines) under a key, in memory and on disk.
+        """
+        entry = (league, value, self._stamp(key), time.time(),
+                 league.game_count() if league else 0)
+        self._save(key, entry)
+        self._remember(key, entry)
+
+    def _lookup(self, key):
+        """
+        Return the entry for a key if it is in memory and still fresh,
+        marking it as the most recently used. Stale entries are dropped.
+        """
+        entry = self._forget(key)
+        if entry is None or not self._fresh(key, entry[2], entry[3]):
+            return None
+        self.entries[key] = entry
+        self.games += entry[4]
+        return entry
+
+    def _remember(self, key, entry):
+        """
+        Keep an entry in memory, dropping the least recently used entries
+        if there are too many or they hold too many games. The newest
+        entry is always kept.
+        """
+        self._forget(key)
+        self.entries[key] = entry
+        self.games += entry[4]
+        while len(self.entries) > 1 and (len(self.entries) > self.size or
+                                         self.games > self.max_games):
+            self._forget(next(iter(self.entries)))
+
+    def _forget(self, key):
+        entry = self.entries.pop(key, None)
+        if entry is not None:
+            self.games -= entry[4]
+        return entry
+
+    def _filename(self, key):
+        return os.path.join(self.path,
+                            hashlib.md5(json.dumps(key)).hexdigest() + '.json')
+
+    def _stamp(self, key):
+        """
+        Which week a result is good for. None means it never expires.
+        """
+        if CURRENT_YEAR in key[0]:
+            return (CURRENT_YEAR, CURRENT_WEEK)
+        return None
+
+    def _fresh(self, key, stamp, saved):
+        """
+        Return True if a result made at time `saved` can still be used.
+        """
+        if stamp != self._stamp(key):
+            return False
+        if stamp and time.time() - saved > CURRENT_SEASON_TTL:
+            return False
+        return True
+
+    def _load(self, key):
+        """
+        Read a result from disk. A file that can't be parsed (say, from
+        a run that was killed while writing it) is deleted and counts as
+        a miss.
+        """
+        if not self.path:
+            return None
+        filename = self._filename(key)
+        if not os.path.exists(filename):
+            return None
+        try:
+            with open(filename) as cached:
+                saved = json.load(cached)
+            if saved['key'] != json.loads(json.dumps(key)):
+                return None
+            stamp = tuple(saved['stamp']) if saved['stamp'] else None
+            entry = (None, _utf8(saved['value']), stamp, saved['time'], 0)
+        except (IOError, OSError):
+            return None
+        except (ValueError, KeyError, TypeError, AttributeError):
+            try:
+                os.remove(filename)
+            except OSError:
+                pass
+            return None
+        if not self._fresh(key, entry[2], entry[3]):
+            return None
+        return entry
+
+    def _save(self, key, entry):
+        """
+        Write a result to disk. It is written to a temporary file first
+        so that the real file is never left half-written. If it can't be
+        written, the result is still returned, just not saved.
+        """
+        if not self.path:
+            return
+        saved = {'key': key, 'value': entry[1], 'stamp': entry[2],
+                 'time': entry[3]}
+        temp = None
+        try:
+            handle, temp = tempfile.mkstemp(suffix='.tmp', dir=self.path)
+            with os.fdopen(handle, 'w') as cached:
+                json.dump(saved, cached)
+            os.rename(temp, self._filename(key))
+        except (IOError, OSError) as error:
+            print >> sys.stderr, \
+                "WARNING: couldn't save to cache: {}".format(error)
+            if temp and os.path.exists(temp):
+                os.remove(temp)
+
+    def clear(self):
+        """
+        Forget every query, in memory and on disk, along with any warm
+        progress saved with them.
+        """
+        self.entries.clear()
+        self.games = 0
+        if self.path:
+            for filename in os.listdir(self.path):
+                if filename.endswith('.json') or filename.endswith('.tmp') \
+                   or filename == WARM_PROGRESS:
+                    os.remove(os.path.join(self.path, filename))
+
+    def __repr__(self):
+        return 'cache: {} hits, {} disk hits, {} misses'.format(
+            self.hits, self.disk_hits, self.misses)
+
+def run(year, week, which_team, site, cum=False, rate=False, window=None,
+        split=None, cache=None):
     """
     Collect and print the stats for the selected team(s) and week(s).
     """
-    league = League(year, week, which_team, site, cum, rate)
+    if cache is None:
+        league = League(year, week, which_team, site, cum, rate, window, split)
+        league.compile()
+        print league
+    else:
+        print cache.table(year, week, which_team, site, cum, rate, window,
+                          split)
+        print >> sys.stderr, cache
+
+def warm_season(year, week):
+    """
+    Compile one season and build everything people look at most: the
+    stat tables for all teams and each single team, home and away, with
+    every combination of cumulative and rate stats, plus the player
+    stats, play-by-play and scoring plays for every game. The season is
+    only compiled once; each table comes from a copy of the League that
+    shows a different part of it. Returns the number of games and a list
+    of (key, value) pairs ready for QueryCache.put().
+    """
+    all_teams = [team[0] for team in ng.teams]
+    league = League([year], week, all_teams, ['home', 'away'], True, True)
     league.compile()
-    print league
+    games = 0
+    results = []
+    for which_team in [all_teams] + [[team] for team in all_teams]:
+        for cum in [False, True]:
+            for rate in [False, True]:
+                view = copy.copy(league)
+                view.which_team = which_team
+                view.cum = cum
+                view.rate = rate
+                results.append((QueryCache.league_key(view), str(view)))
+    for team in all_teams:
+        for w, weekdict in league.teams[team].get(year, {}).items():
+            if 'game' not in weekdict['OWN']:
+                continue
+            if weekdict['OWN']['site'] == 'home':
+                games += 1
+            for variety in GAME_VIEWS:
+                results.append((QueryCache.game_key(variety, team, year, w),
+                                league.game_view(variety, team, year, w)))
+    return games, results
+
+def _warm_task(year_week):
+    """
+    Helper for warm() so seasons can be handed to a pool of processes.
+    Errors are returned as text instead of raised so one bad season
+    doesn't stop the others.
+    """
+    year, week = year_week
+    try:
+        games, results = warm_season(year, week)
+    except Exception as error:
+        return year, 0, None, '{}: {}'.format(type(error).__name__, error)
+    return year, games, results, None
+
+def warm(year, week, cache, jobs=4, restart=False):
+    """
+    Fill the cache for the selected year(s) and week(s), compiling up to
+    `jobs` seasons at once in separate processes. Finished seasons are
+    written to a progress file in the cache directory so an interrupted
+    run picks up where it left off. The current season is never marked
+    as done.
+    """
+    if not cache.path:
+        print "ERROR: warm needs a cache directory"
+        return
+    progress = os.path.join(cache.path, WARM_PROGRESS)
+    weeks = ','.join(str(w) for w in sorted(week))
+    done = set()
+    if restart and os.path.exists(progress):
+        os.remove(progress)
+    if os.path.exists(progress):
+        with open(progress) as log:
+            done = set(line.strip() for line in log if line.strip())
+    todo = []
+    skipped = 0
+    for y in sorted(year):
+        if '{} {}'.format(y, weeks) in done:
+            skipped += 1
+        elif y <= CURRENT_YEAR:
+            todo.append((y, week))
+    print "warming {} season(s), {} already done".format(len(todo), skipped)
+    games = 0
+    failed = []
+    start = time.time()
+    pool = Pool(max(1, jobs))
+    try:
+        with open(progress, 'a') as log:
+            for y, count, results, error in pool.imap_unordered(_warm_task,
+                                                                todo):
+                if error is not None:
+                    failed.append(y)
+                    print "{}: failed ({})".format(y, error)
+                    continue
+                for key, value in results:
+                    cache.put(key, value)
+                games += count
+                if y < CURRENT_YEAR:
+                    log.write('{} {}\n'.format(y, weeks))
+                    log.flush()
+                print "{}: {} games, {} results".format(y, count, len(results))
+    finally:
+        pool.terminate()
+        pool.join()
+        elapsed = time.time() - start
+        rate = games / elapsed if elapsed else 0
+        print "warmed {} games in {:.1f}s ({:.2f} games/sec)".format(
+            games, elapsed, rate)
+        if failed:
+            print "failed seasons: {}".format(
+                ', '.join(str(y) for y in sorted(failed)))
 
 def parse_seq(arg_str, default_value, acceptable, integer=True):
     """
@@ -440,11 +981,49 @@ def parse_seq(arg_str, default_value, acceptable, integer=True):
             return default_value
     return list(set(new_sequence))
 
+def main_warm(argv):
+    """
+    Parse the command-line arguments for the 'warm' command and run it.
+    """
+    import argparse
+    parser = argparse.ArgumentParser(prog="nflstats.py warm",
+                        description="""Save the stats for a given season(s)
+                        ahead of time, so that the GUI and later queries
+                        using the same --cache directory don't have to
+                        collect them""")
+    parser.add_argument("--cache", default=CACHE_DIR,
+                        help="""Directory to save results in. The GUI
+                        always uses the default. Default value is
+                        {}""".format(CACHE_DIR))
+    parser.add_argument("-y", "--year",
+                        help="""Which year(s) do you want to save?
+                        Acceptable years are between 2009 and 2015.
+                        Use '2009,2011-2013,...' for multiple years.
+                        Default value is 2013-2014""")
+    parser.add_argument("-w", "--week",
+                        help="""Which week(s) do you want to include?
+                        Acceptable weeks are between 1 and 17.
+                        Use '1-5,7,...' for multiple weeks.
+                        Defaults to include all weeks.""")
+    parser.add_argument("-j", "--jobs", type=int, default=4,
+                        help="""How many seasons to compile at once, each
+                        in its own process. Default value is 4""")
+    parser.add_argument("--restart",
+                        help="""Flag to forget which seasons are already
+                        done and save every season again.""",
+                        action='store_true')
+    args = parser.parse_args(argv)
+    year = parse_seq(args.year, [2013, 2014], list(range(2009, 2016)))
+    week = parse_seq(args.week, list(range(1, 18)), list(range(1, 18)))
+    warm(year, week, QueryCache(path=args.cache), args.jobs, args.restart)
+
 def main():
     """
     Parse the command-line arguments and run the program accordingly.
     """
     import argparse
+    if len(sys.argv) > 1 and sys.argv[1] == 'warm':
+        return main_warm(sys.argv[2:])
     parser = argparse.ArgumentParser(description="""Display NFL team
                         stats for a given season, teams and weeks""")
     parser.add_argument("-y", "--year",
@@ -474,13 +1053,39 @@ def main():
                         help="""Flag to show rate stats instead of gross
                         stats.""",
                         action='store_true')
+    parser.add_argument("-n", "--window", type=int,
+                        help="""Show stats totalled over each team's last
+                        N games instead of the whole season. Implies
+                        --cum.""")
+    parser.add_argument("--split", choices=SPLITS,
+                        help="""Total home and away games separately
+                        ('site'), or division and non-division games
+                        separately ('division'). Implies --cum.""")
+    parser.add_argument("--cache",
+                        help="""Directory to save results in. Asking for
+                        the same stats again reads them from here instead
+                        of collecting them again.""")
+    parser.add_argument("--clear-cache",
+                        help="""Flag to delete everything saved in the
+                        --cache directory before getting the stats.""",
+                        action='store_true')
     args = parser.parse_args()
     year = parse_seq(args.year, [2013, 2014], list(range(2009, 2016)))
     week = parse_seq(args.week, list(range(1, 18)), list(range(1, 18)))
     team = parse_seq(args.team, [team[0] for team in ng.teams],
                      [team[0] for team in ng.teams], False)
     site = parse_seq(args.site, ['home', 'away'], ['home', 'away'], False)
-    run(year, week, team, site, args.cum, args.rate)
+    if args.window is not None and args.window < 1:
+        print "WARNING: {} is not an acceptable window".format(args.window)
+        print "using the whole season instead"
+        args.window = None
+    cache = QueryCache(path=args.cache) if args.cache else None
+    if args.clear_cache:
+        if cache is None:
+            parser.error("--clear-cache needs a --cache directory")
+        cache.clear()
+    run(year, week, team, site, args.cum, args.rate, args.window, args.split,
+        cache)
 
 if __name__ == '__main__':
     main()
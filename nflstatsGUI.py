@@ -15,7 +15,7 @@ DEPENDENCIES:
     nflgame (pip install nflgame) or (https://github.com/BurntSushi/nflgame)
 """
 
-from nflstats import League, parse_seq
+from nflstats import CACHE_DIR, QueryCache, parse_seq
 import Tkinter as gui
 import nflgame as ng
 
@@ -26,13 +26,17 @@ SITES = ["All", "home", "away"]
 
 class Status(object):
     def __init__(self):
-        self.league = None
+        self.query = None
+        self.table = ''
+        self.cache = QueryCache(path=CACHE_DIR)
 
-    def set_league(self, league):
-        self.league = league
+    def set_query(self, query, table):
+        self.query = query
+        self.table = table
 
 
-def get_results(team_list, year_list, week_list, site_list, cum, rate, widget, status):
+def get_results(team_list, year_list, week_list, site_list, cum, rate, widget,
+                status, cache_label):
     teams_index = map(int, team_list.curselection())
     teams = [TEAMS[index] for index in teams_index]
     if "All" in teams:
@@ -65,16 +69,16 @@ def get_results(team_list, year_list, week_list, site_list, cum, rate, widget, s
         site_str = ','.join(sites)
         thissite = parse_seq(site_str, ['home', 'away'],
                              ['home', 'away'], False)
-    league = League(thisyear, thisweek, thisteam, thissite, cum.get(), rate.get())
-    league.compile()
-    status.set_league(league)
+    query = (thisyear, thisweek, thisteam, thissite, cum.get(), rate.get())
+    status.set_query(query, status.cache.table(*query))
+    cache_label.config(text = str(status.cache))
     widget.delete(0, gui.END)
-    for line in str(league).splitlines():
+    for line in status.table.splitlines():
         widget.insert(gui.END, str(line))
 
-def game_stats(game_list, status, widget, variety):
-    if status.league:
-        all_games = str(status.league).splitlines()
+def game_stats(game_list, status, widget, variety, cache_label):
+    if status.query:
+        all_games = status.table.splitlines()
         game_index = map(int, game_list.curselection())
         games = [all_games[index] for index in game_index]
         widget.delete(0, gui.END)
@@ -82,17 +86,11 @@ def game_stats(game_list, status, widget, variety):
             gamesplit = game.split()[:3]
             if gamesplit[0] in TEAMS:
                 team, year, week = game.split()[:3]
-                game_obj = status.league.teams[team][int(year)][int(week)]['OWN']['game']
-                stats = []
-                if variety == 'player':
-                    stats = status.league.game_player_stats(team, int(year), int(week))
-                elif variety == 'pbp':
-                    stats = status.league.game_pbp(team, int(year), int(week))
-                elif variety == 'scores':
-                    stats = status.league.game_scoring_plays(team, int(year), int(week))
+                stats = status.cache.game_view(variety, team, int(year), int(week))
                 for row in stats:
                     widget.insert(gui.END, str(row))
                 widget.insert(gui.END, '-' * 150)
+        cache_label.config(text = str(status.cache))
 
 def runGUI():
     status = Status()
@@ -167,22 +165,25 @@ def runGUI():
                               font = ["courier new", 14])
     game_info.insert(gui.END, "Player stats")
 
+    cache_label = gui.Label(selector, text = str(status.cache))
+
     button1 = gui.Button(selector, text = 'Get Game Stats', width = 20,
         command = lambda: get_results(team_list, year_list, week_list, site_list,
-                                      cum_var, rate_var, league_info, status))
+                                      cum_var, rate_var, league_info, status,
+                                      cache_label))
 
     player_button = gui.Button(button_frame, text = 'Get Player Stats', width = 40,
                                command = lambda: game_stats(league_info,
                                                             status, game_info,
-                                                            'player'))
+                                                            'player', cache_label))
     pbp_button = gui.Button(button_frame, text = 'Get Play-By-Play', width = 40,
                             command = lambda: game_stats(league_info,
                                                          status, game_info,
-                                                         'pbp'))
+                                                         'pbp', cache_label))
     scores_button = gui.Button(button_frame, text = 'Get Scoring Plays', width = 40,
                                command = lambda: game_stats(league_info,
                                                             status, game_info,
-                                                            'scores'))
+                                                            'scores', cache_label))
 
     league_info.pack()
     player_button.pack(side = gui.LEFT)
@@ -207,6 +208,7 @@ def runGUI():
     cum_button.pack()
     rate_button.pack()
     button1.pack()
+    cache_label.pack()
     player_frame.pack(side = gui.LEFT)
     game_info.pack()
 